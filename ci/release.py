@@ -9,6 +9,9 @@ import magic
 import requests
 
 
+CHUNK_SIZE = 64 * 1024  # Bytes per read when hashing release assets.
+
+
 def main():
     args = parse_args()
     request = Client(args.owner, args.repo, args.token)
@@ -78,43 +81,64 @@ class Client(object):
         self.owner = owner
         self.repo = repo
         self.token = token
+        self.session = requests.Session()
+        self.session.headers['Authorization'] = 'token %s' % token
 
     def __call__(self, url, method='GET', parse_json_resp=True,
                  api='https://api.github.com', **kwargs):
-        url = '%s/repos/%s/%s%s' % (api, self.owner, self.repo, url)
+        # Relative paths are resolved under the repo; full URLs starting
+        # with `api` (e.g. Link header targets) are used as is.
+        if not url.startswith(api):
+            url = '%s/repos/%s/%s%s' % (api, self.owner, self.repo, url)
         headers = kwargs.pop('headers', {})
-        headers.update({'Authorization': 'token %s' % self.token})
         print "Will make %s request to %s: %s" % (method, url, kwargs)
-        resp = requests.request(method, url, headers=headers, **kwargs)
+        resp = self.session.request(method, url, headers=headers, **kwargs)
         if not resp.ok:
             print resp.status_code
             print resp.text
             raise Exception(resp.status_code)
         if parse_json_resp:
-            try:
-                return resp.json()
-            except Exception:
-                print "Error decoding json response"
-                print resp.text
-                raise
+            return self._json(resp)
         else:
             return resp
 
+    def _json(self, resp):
+        try:
+            return resp.json()
+        except Exception:
+            print "Error decoding json response"
+            print resp.text
+            raise
+
+    def paginate(self, url, **kwargs):
+        """Yield all items of a paginated list, following Link headers."""
+        params = kwargs.pop('params', {})
+        params.setdefault('per_page', 100)
+        resp = self(url, parse_json_resp=False, params=params, **kwargs)
+        while True:
+            for item in self._json(resp):
+                yield item
+            if 'next' not in resp.links:
+                break
+            resp = self(resp.links['next']['url'], parse_json_resp=False,
+                        **kwargs)
+
 
 def print_release(release):
-    print '-' * 60
+    lines = ['-' * 60]
     for name, key in [('id', 'id'), ('name', 'name'),
                       ('tag', 'tag_name'), ('ref', 'target_commitish'),
                       ('draft', 'draft'), ('prerelease', 'prerelease')]:
-        print '%s: %s' % (name, release[key])
-    print 'assets:'
+        lines.append('%s: %s' % (name, release[key]))
+    lines.append('assets:')
     for asset in release['assets']:
-        print ' - %s' % asset['name']
+        lines.append(' - %s' % asset['name'])
     if release['body']:
-        print 'msg: |'
+        lines.append('msg: |')
         for line in release['body'].splitlines():
-            print '  %s' % line
-    print '-' * 60
+            lines.append('  %s' % line)
+    lines.append('-' * 60)
+    print '\n'.join(lines)
 
 
 def update_release(request, tag, msg=None, files=None,
@@ -125,8 +149,7 @@ def update_release(request, tag, msg=None, files=None,
     resp = request('')
 
     # Find git tag corresponding to release.
-    resp = request('/tags')
-    for item in resp:
+    for item in request.paginate('/tags'):
         if item['name'] == tag:
             sha = item['commit']['sha']
             print "Tag %s points to %s" % (tag, sha)
@@ -147,7 +170,7 @@ def update_release(request, tag, msg=None, files=None,
     for key, val in data.items():
         if val is None:
             data.pop(key)
-    for release in request('/releases'):
+    for release in request.paginate('/releases'):
         if release['tag_name'] == tag:
             print "Found preexisting release."
             print_release(release)
@@ -172,23 +195,22 @@ def update_release(request, tag, msg=None, files=None,
     for path in files or []:
         name = os.path.basename(path)
         uploaded = False
-        for i, asset in enumerate(list(assets)):
-            if asset['name'] != name:
-                continue
-            assets.pop(i)
+        matching = [asset for asset in assets if asset['name'] == name]
+        for asset in matching:
+            assets.remove(asset)
             print "Found already uploaded file '%s'" % path
             md5 = hashlib.md5()
             resp = request('/releases/assets/%s' % asset['id'],
                            headers={'Accept': 'application/octet-stream'},
                            parse_json_resp=False, stream=True)
-            for chunk in resp.iter_content(chunk_size=1024):
+            for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
                 if chunk:
                     md5.update(chunk)
             md5sum_remote = md5.hexdigest()
             md5 = hashlib.md5()
             with open(path, 'rb') as fobj:
                 while True:
-                    chunk = fobj.read(1024)
+                    chunk = fobj.read(CHUNK_SIZE)
                     if not chunk:
                         break
                     md5.update(chunk)